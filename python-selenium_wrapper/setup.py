@@ -77,6 +77,7 @@ setup(
         # eg:
         #   'rst': ['docutils>=0.11'],
         #   ':python_version=="2.6"': ['argparse'],
+        'async': ['aiohttp'],
     },
     entry_points={
         'console_scripts': [
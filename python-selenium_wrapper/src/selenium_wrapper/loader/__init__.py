@@ -1 +1,3 @@
 from .set_up_driver import *
+from .driver_pool import *
+from .crawl_runner import *
@@ -1,15 +1,22 @@
 import os
 import sys
-from typing import List
+from typing import List, Optional
 
 from selenium import webdriver
 
 from ..wrapper.web_driver_wrapper import WebDriverWrapper
 
 
-def get_firefox_driver(headless: bool = False) -> WebDriverWrapper:
+def get_firefox_driver(headless: bool = False, unhandled_prompt_behavior: Optional[str] = None) -> WebDriverWrapper:
+    """
+    headless: start in headless mode
+    unhandled_prompt_behavior: W3C unhandledPromptBehavior capability, e.g. "dismiss" lets the driver close
+        dialogs itself
+    """
     options = webdriver.firefox.options.Options()
     options.headless = headless
+    if unhandled_prompt_behavior:
+        options.set_capability("unhandledPromptBehavior", unhandled_prompt_behavior)
     options.add_argument("user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
                          "Chrome/81.0.4044.141 Safari/537.36")
     options.add_argument("--lang=de-DE")
@@ -25,13 +32,18 @@ def get_firefox_driver(headless: bool = False) -> WebDriverWrapper:
     return WebDriverWrapper(driver)
 
 
-def get_chrome_driver(headless: bool = False, extensions: List[str] = None) -> WebDriverWrapper:
+def get_chrome_driver(headless: bool = False, extensions: List[str] = None,
+                      unhandled_prompt_behavior: Optional[str] = None) -> WebDriverWrapper:
     """
     headless: start in headless mode
     extensions: each list element needs to be a path to a zip file containing the extension
+    unhandled_prompt_behavior: W3C unhandledPromptBehavior capability, e.g. "dismiss" lets the driver close
+        dialogs itself
     """
     options = webdriver.chrome.options.Options()
     options.headless = headless
+    if unhandled_prompt_behavior:
+        options.set_capability("unhandledPromptBehavior", unhandled_prompt_behavior)
     options.add_argument("user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
                          "Chrome/89.0.4389.114 Safari/537.36")
     options.add_argument("--lang=de-De")
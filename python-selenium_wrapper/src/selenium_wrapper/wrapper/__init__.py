@@ -1,2 +1,4 @@
 from .web_driver_wrapper import *
 from .web_element_wrapper import *
+from .page_readiness import *
+from .async_web_driver_wrapper import *
@@ -0,0 +1,99 @@
+"""
+JavaScript snippets that are sent to the browser by the wrappers.
+Every script collects its data for a whole list of elements, so that it costs a single round trip.
+"""
+
+# arguments: elements, fields, attribute names, css property names
+SNAPSHOT_SCRIPT = """
+const elements = arguments[0], fields = arguments[1], attributes = arguments[2], properties = arguments[3];
+const scrollX = window.pageXOffset, scrollY = window.pageYOffset;
+return elements.map(function (el) {
+    const result = {};
+    if (fields.indexOf("rect") >= 0) {
+        const r = el.getBoundingClientRect();
+        result.rect = {"x": r.left + scrollX, "y": r.top + scrollY, "width": r.width, "height": r.height};
+    }
+    if (fields.indexOf("tag_name") >= 0) {
+        result.tag_name = el.tagName.toLowerCase();
+    }
+    if (fields.indexOf("text") >= 0) {
+        let text = (el.innerText || "").trim();
+        if (!text && el.tagName.toLowerCase() === "input") {
+            text = (el.value || "").trim();
+        }
+        result.text = text;
+    }
+    if (attributes.length) {
+        result.attributes = {};
+        attributes.forEach(function (name) {
+            // Same lookup as WebElement.get_attribute: the property if it is a plain value, else the attribute
+            const prop = el[name];
+            let value;
+            if (typeof prop === "boolean") {
+                value = prop ? "true" : null;
+            } else if (prop !== undefined && prop !== null && typeof prop !== "object" && typeof prop !== "function") {
+                value = prop;
+            } else {
+                value = el.getAttribute(name);
+            }
+            result.attributes[name] = value;
+        });
+    }
+    if (properties.length) {
+        const style = window.getComputedStyle(el);
+        result.css = {};
+        properties.forEach(function (name) {
+            result.css[name] = style.getPropertyValue(name);
+        });
+    }
+    return result;
+});
+"""
+
+# arguments: elements. Lowest element that is a proper ancestor of the first element and of all others.
+COMMON_ANCESTOR_SCRIPT = """
+const elements = arguments[0];
+const others = elements.slice(1);
+let node = elements[0].parentElement;
+while (node && !others.every(function (el) { return el !== node && node.contains(el); })) {
+    node = node.parentElement;
+}
+return node;
+"""
+
+# arguments: ancestor, elements
+ANCESTRY_SCRIPT = """
+const ancestor = arguments[0];
+return arguments[1].map(function (el) { return el !== ancestor && ancestor.contains(el); });
+"""
+
+# Plain statements without arguments, so that it can also be registered to run before the page scripts.
+# Dialogs are dismissed: confirm returns false, prompt returns null.
+DIALOG_OVERRIDE_SCRIPT = """
+(function () {
+    if (window.__seleniumWrapperDialogs) {
+        return;
+    }
+    const dialogs = window.__seleniumWrapperDialogs = [];
+    function record(type, message) {
+        dialogs.push({"type": type, "message": message === undefined ? "" : String(message)});
+    }
+    window.alert = function (message) { record("alert", message); };
+    window.confirm = function (message) { record("confirm", message); return false; };
+    window.prompt = function (message) { record("prompt", message); return null; };
+})();
+"""
+
+COLLECT_DIALOGS_SCRIPT = """
+return window.__seleniumWrapperDialogs ? window.__seleniumWrapperDialogs.splice(0) : [];
+"""
+
+# arguments: elements, color, border width, border style
+MARK_ELEMENTS_SCRIPT = """
+const color = arguments[1], width = arguments[2], style = arguments[3];
+arguments[0].forEach(function (el) {
+    el.style.borderColor = color;
+    el.style.borderWidth = width;
+    el.style.borderStyle = style;
+});
+"""
@@ -0,0 +1,101 @@
+import time
+from typing import Iterable, Optional, Union
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# document.readyState is "complete"
+READY_STATE = "ready_state"
+# No DOM mutation for quiet_period seconds
+DOM_QUIET = "dom_quiet"
+# Page is complete and no resource finished loading for quiet_period seconds (Resource Timing API)
+NETWORK_IDLE = "network_idle"
+
+READINESS_CONDITIONS = (READY_STATE, DOM_QUIET, NETWORK_IDLE)
+
+# arguments: conditions, quiet period in ms, maximum time to wait in ms, callback.
+# The observer state lives on the window, so that it survives between calls and is dropped on navigation.
+_READY_SCRIPT = """
+const conditions = arguments[0], quietMs = arguments[1], sliceMs = arguments[2];
+const done = arguments[arguments.length - 1];
+let state = window.__seleniumWrapperReadiness;
+if (!state) {
+    state = window.__seleniumWrapperReadiness = {"lastMutation": performance.now(), "resources": -1, "lastResource": 0};
+    new MutationObserver(function () { state.lastMutation = performance.now(); })
+        .observe(document, {"childList": true, "subtree": true, "attributes": true, "characterData": true});
+    if (performance.setResourceTimingBufferSize) {
+        performance.setResourceTimingBufferSize(100000);
+    }
+}
+function predicate() {
+    return (%s);
+}
+function ready() {
+    const now = performance.now();
+    for (let i = 0; i < conditions.length; i++) {
+        const condition = conditions[i];
+        if (condition === "ready_state" && document.readyState !== "complete") {
+            return false;
+        }
+        if (condition === "dom_quiet" && now - state.lastMutation < quietMs) {
+            return false;
+        }
+        if (condition === "network_idle") {
+            const resources = performance.getEntriesByType("resource").length;
+            if (resources !== state.resources) {
+                state.resources = resources;
+                state.lastResource = now;
+            }
+            if (document.readyState !== "complete" || now - state.lastResource < quietMs) {
+                return false;
+            }
+        }
+    }
+    try {
+        return !!predicate();
+    } catch (e) {
+        return false;
+    }
+}
+const start = performance.now();
+(function poll() {
+    if (ready()) {
+        done(true);
+    } else if (performance.now() - start >= sliceMs) {
+        done(false);
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+
+def wait_until_ready(driver: WebDriver, conditions: Union[str, Iterable[str]] = READY_STATE,
+                     predicate: Optional[str] = None, timeout: float = 10, quiet_period: float = 0.5,
+                     slice_time: float = 1) -> Optional[float]:
+    """
+    Waits inside the browser until the page fulfills all conditions, returns as soon as they hold.
+    :param driver: Selenium driver
+    :param conditions: Any of READY_STATE, DOM_QUIET and NETWORK_IDLE
+    :param predicate: Custom JavaScript expression, the page is only ready if it evaluates to a truthy value
+    :param timeout: Upper bound for the time to wait in seconds
+    :param quiet_period: Seconds without DOM mutations or finished requests for DOM_QUIET and NETWORK_IDLE
+    :param slice_time: Maximum duration of a single async script call, has to stay below the driver's script timeout
+    :return: Seconds waited until the page was ready, None if it was not ready within timeout
+    """
+    if isinstance(conditions, str):
+        conditions = [conditions]
+    conditions = list(conditions)
+    unknown = set(conditions) - set(READINESS_CONDITIONS)
+    if unknown:
+        raise ValueError(f"Unknown readiness conditions: {sorted(unknown)}")
+
+    script = _READY_SCRIPT % (predicate or "true")
+    start = time.monotonic()
+    deadline = start + timeout
+    while True:
+        remaining = max(deadline - time.monotonic(), 0)
+        if driver.execute_async_script(script, conditions, int(quiet_period * 1000),
+                                       int(min(slice_time, remaining) * 1000)):
+            return time.monotonic() - start
+        if time.monotonic() >= deadline:
+            return None
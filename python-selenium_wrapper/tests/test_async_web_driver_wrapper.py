@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from selenium_wrapper.wrapper.async_web_driver_wrapper import ELEMENT_KEY
+from selenium_wrapper.wrapper.async_web_driver_wrapper import AsyncWebDriverWrapper
+
+web = pytest.importorskip("aiohttp.web")
+
+RECTS = {
+    "body": {"x": 0, "y": 0, "width": 100, "height": 200},
+    "a": {"x": 10, "y": 10, "width": 10, "height": 10},
+}
+
+
+def make_app(requests):
+    async def new_session(request):
+        return web.json_response({"value": {"sessionId": "s1", "capabilities": {}}})
+
+    async def navigate(request):
+        requests.append(("url", (await request.json())["url"]))
+        return web.json_response({"value": None})
+
+    async def find(request):
+        payload = await request.json()
+        requests.append(("find", payload["value"]))
+        if payload["value"] not in RECTS:
+            return web.json_response({"value": {"error": "no such element", "message": "missing"}}, status=404)
+        reference = {ELEMENT_KEY: payload["value"]}
+        if request.path.endswith("/elements"):
+            return web.json_response({"value": [reference]})
+        return web.json_response({"value": reference})
+
+    async def rect(request):
+        requests.append(("rect", request.match_info["id"]))
+        return web.json_response({"value": RECTS[request.match_info["id"]]})
+
+    async def delete(request):
+        requests.append(("delete", None))
+        return web.json_response({"value": None})
+
+    app = web.Application()
+    app.router.add_post("/session", new_session)
+    app.router.add_post("/session/s1/url", navigate)
+    app.router.add_post("/session/s1/element", find)
+    app.router.add_post("/session/s1/elements", find)
+    app.router.add_get("/session/s1/element/{id}/rect", rect)
+    app.router.add_delete("/session/s1", delete)
+    return app
+
+
+def test_async_driver_against_w3c_endpoint():
+    requests = []
+
+    async def scenario():
+        runner = web.AppRunner(make_app(requests))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with await AsyncWebDriverWrapper.create(f"http://127.0.0.1:{port}") as driver:
+                assert await driver.get("example.com")
+                body = await driver.find_element_by_tag_name("body")
+                links = await driver.find_elements_by_tag_name("a")
+                results = await asyncio.gather(*(body.visually_contains(link) for link in links * 3))
+                assert results == [True, True, True]
+                assert await driver.relative_size_of_element(links[0]) == 100 / 20000
+                with pytest.raises(NoSuchElementException):
+                    await driver.find_element_by_tag_name("table")
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(scenario())
+    assert ("url", "http://www.example.com") in requests
+    assert requests[-1] == ("delete", None)
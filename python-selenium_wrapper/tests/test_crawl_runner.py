@@ -0,0 +1,46 @@
+import os
+import time
+
+from selenium_wrapper.loader.crawl_runner import CrawlRunner
+
+
+class FakeDriver:
+    def __init__(self):
+        self.url = None
+
+    def get(self, url, **kwargs):
+        self.url = url
+        return url != "unreachable"
+
+    def is_alive(self):
+        return True
+
+    def close_driver(self):
+        pass
+
+
+def upper_url(driver):
+    if driver.url == "crash":
+        os._exit(1)
+    if driver.url == "hang":
+        time.sleep(60)
+    return driver.url.upper()
+
+
+def test_crawl_runner_streams_results_in_order():
+    runner = CrawlRunner(upper_url, FakeDriver, processes=2, retries=1)
+    results = list(runner.run(f"url{i}" for i in range(10)))
+    assert [result.result for result in results] == [f"URL{i}" for i in range(10)]
+    assert all(result.ok and result.attempts == 1 for result in results)
+
+
+def test_crawl_runner_recovers_from_failures():
+    runner = CrawlRunner(upper_url, FakeDriver, processes=2, retries=1, url_timeout=0.5, startup_timeout=0,
+                         ordered=False)
+    results = {result.url: result for result in runner.run(["a", "crash", "unreachable", "hang", "b"])}
+    assert results["a"].result == "A"
+    assert results["b"].result == "B"
+    assert results["crash"].error.startswith("Worker crashed")
+    assert results["hang"].error == "Timeout"
+    assert "failed to load" in results["unreachable"].error
+    assert results["crash"].attempts == 2
@@ -0,0 +1,60 @@
+import pytest
+
+from selenium_wrapper.loader.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.resets = 0
+        self.closed = False
+
+    def is_alive(self):
+        return self.alive
+
+    def reset_session(self):
+        self.resets += 1
+
+    def close_driver(self):
+        self.closed = True
+
+
+def test_pool_reuses_and_resets_drivers():
+    pool = DriverPool(FakeDriver, min_size=1, max_size=2)
+    assert pool.size == 1
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+    assert first is second
+    assert first.resets == 2
+    pool.close()
+    assert first.closed
+
+
+def test_pool_recycles_after_max_uses():
+    pool = DriverPool(FakeDriver, min_size=1, max_size=1, max_uses=2)
+    first = pool.checkout()
+    pool.checkin(first)
+    assert pool.checkout() is first
+    pool.checkin(first)
+    assert first.closed
+    assert pool.size == 1
+    assert pool.checkout() is not first
+
+
+def test_pool_replaces_dead_driver():
+    pool = DriverPool(FakeDriver, min_size=1, max_size=1)
+    first = pool.checkout()
+    pool.checkin(first)
+    first.alive = False
+    second = pool.checkout()
+    assert second is not first
+    assert first.closed
+
+
+def test_pool_checkout_timeout():
+    pool = DriverPool(FakeDriver, min_size=0, max_size=1)
+    pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.01)
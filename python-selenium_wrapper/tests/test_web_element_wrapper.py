@@ -0,0 +1,65 @@
+from selenium_wrapper.wrapper.web_element_wrapper import WebElementWrapper
+
+
+class FakeElement:
+    def __init__(self, rect, tag_name="div"):
+        self._rect = rect
+        self._tag_name = tag_name
+        self.rect_reads = 0
+
+    @property
+    def rect(self):
+        self.rect_reads += 1
+        return dict(self._rect)
+
+    @property
+    def tag_name(self):
+        return self._tag_name
+
+
+class FakeDriverWrapper:
+    page_epoch = 0
+
+    def invalidate_element_cache(self):
+        self.page_epoch += 1
+
+
+def test_rect_is_cached_per_page_epoch():
+    driver = FakeDriverWrapper()
+    outer = WebElementWrapper(FakeElement({"x": 0, "y": 0, "width": 100, "height": 100}), driver)
+    inner = WebElementWrapper(FakeElement({"x": 10, "y": 10, "width": 10, "height": 10}), driver)
+
+    assert outer.visually_contains(inner)
+    assert not inner.visually_contains(outer)
+    assert outer.is_in_window_or_has_size()
+    assert outer.raw_element.rect_reads == 1
+    assert inner.raw_element.rect_reads == 1
+
+    driver.invalidate_element_cache()
+    assert outer.size == 10000
+    assert outer.raw_element.rect_reads == 2
+
+    outer.refresh()
+    assert outer.size == 10000
+    assert outer.raw_element.rect_reads == 3
+
+
+def test_rect_is_not_cached_without_driver():
+    element = WebElementWrapper(FakeElement({"x": 0, "y": 0, "width": 1, "height": 1}))
+    assert element.has_width_or_height()
+    assert element.has_width_or_height()
+    assert element.raw_element.rect_reads == 2
+
+
+def test_snapshot_values_are_served_locally():
+    driver = FakeDriverWrapper()
+    element = WebElementWrapper(FakeElement({"x": 0, "y": 0, "width": 1, "height": 1}), driver)
+    element._store_snapshot({"rect": {"x": 1, "y": 2, "width": 3, "height": 4}, "tag_name": "span", "text": "abc",
+                             "attributes": {"href": "/"}, "css": {"color": "red"}})
+
+    assert element.rect == {"x": 1, "y": 2, "width": 3, "height": 4}
+    assert element.tag_name == "span"
+    assert element.text == "abc"
+    assert element.get_attribute("href") == "/"
+    assert element.value_of_css_property("color") == "red"
+    assert element.raw_element.rect_reads == 0
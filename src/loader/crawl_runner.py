@@ -0,0 +1,218 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..wrapper.web_driver_wrapper import WebDriverWrapper
+from .set_up_driver import get_firefox_driver
+
+
+class CrawlResult(NamedTuple):
+    index: int
+    url: str
+    result: Any
+    error: Optional[str]
+    attempts: int
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _terminate(signum, frame):
+    raise SystemExit(0)
+
+
+def _worker_main(driver_factory: Callable[[], WebDriverWrapper], callback: Callable[[WebDriverWrapper], Any],
+                 get_kwargs: Dict, tasks, results, worker: Tuple[int, int]) -> None:
+    """
+    Loop of a worker process. It owns one long-lived driver, which is only replaced if it stops responding.
+    """
+    signal.signal(signal.SIGTERM, _terminate)
+    driver = None
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, url = task
+            try:
+                if driver is None:
+                    driver = driver_factory()
+                if not driver.get(url, **get_kwargs):
+                    raise RuntimeError(f"{url} failed to load")
+                results.put((worker, index, callback(driver), None))
+            except Exception as e:
+                results.put((worker, index, None, f"{type(e).__name__}: {e}"))
+                if driver is not None and not driver.is_alive():
+                    driver.close_driver()
+                    driver = None
+    finally:
+        if driver is not None:
+            driver.close_driver()
+
+
+class _Worker:
+    def __init__(self, context, slot: int, generation: int, target_args: Tuple):
+        self.key = (slot, generation)
+        self.tasks = context.Queue()
+        self.process = context.Process(target=_worker_main, args=target_args + (self.tasks, self.key), daemon=True)
+        self.process.start()
+        self.task: Optional[Tuple[int, str]] = None
+        self.deadline: Optional[float] = None
+        self.fresh = True
+
+    def assign(self, index: int, url: str, timeout: float) -> None:
+        self.task = (index, url)
+        self.deadline = time.monotonic() + timeout
+        self.tasks.put(self.task)
+
+    def stop(self, force: bool = False) -> None:
+        if force:
+            self.process.terminate()
+        else:
+            self.tasks.put(None)
+        self.process.join(10)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class CrawlRunner:
+    """
+    Processes urls with a pool of worker processes, each of which owns one long-lived driver.
+    For every url the worker loads the page with WebDriverWrapper.get and calls callback(driver), results are
+    streamed back as CrawlResult in input order or as soon as they are done.
+
+    Failed urls are retried, a url that exceeds url_timeout gets its worker terminated, and crashed workers are
+    replaced. callback and driver_factory have to be picklable, e.g. module level functions or functools.partial.
+
+    Usage:
+        runner = CrawlRunner(extract_links, functools.partial(get_chrome_driver, headless=True), processes=8)
+        for result in runner.run(urls):
+            ...
+    """
+
+    def __init__(self, callback: Callable[[WebDriverWrapper], Any],
+                 driver_factory: Callable[[], WebDriverWrapper] = get_firefox_driver, processes: Optional[int] = None,
+                 retries: int = 1, url_timeout: float = 120, startup_timeout: float = 60, ordered: bool = True,
+                 get_kwargs: Optional[Dict] = None, mp_context: Optional[str] = None):
+        """
+        :param callback: Called with the driver after the page was loaded, its return value is the result of the url
+        :param driver_factory: Starts the driver of a worker, e.g. get_firefox_driver or get_chrome_driver
+        :param processes: Number of worker processes, defaults to the number of cpus
+        :param retries: How often a failed, timed out or crashed url is tried again
+        :param url_timeout: Seconds after which a url is aborted, including page load and callback
+        :param startup_timeout: Additional seconds for the first url of a worker, which has to start its browser
+        :param ordered: If True results are yielded in input order, otherwise as soon as they are done
+        :param get_kwargs: Keyword arguments for WebDriverWrapper.get, e.g. {"wait_time": 5}
+        :param mp_context: Multiprocessing start method, e.g. "spawn"
+        """
+        self._callback = callback
+        self._driver_factory = driver_factory
+        self._processes = processes or os.cpu_count() or 1
+        self._retries = retries
+        self._url_timeout = url_timeout
+        self._startup_timeout = startup_timeout
+        self._ordered = ordered
+        self._get_kwargs = get_kwargs or {}
+        self._context = multiprocessing.get_context(mp_context)
+
+    def run(self, urls: Iterable[str]) -> Iterator[CrawlResult]:
+        """
+        Processes all urls. The iterable is consumed lazily, so it can be a generator over a very long list.
+        """
+        results = self._context.Queue()
+        target_args = (self._driver_factory, self._callback, self._get_kwargs, results)
+        generations = itertools.count()
+        workers = [_Worker(self._context, slot, next(generations), target_args) for slot in range(self._processes)]
+
+        pending = iter(enumerate(urls))
+        retry: List[Tuple[int, str]] = []
+        attempts: Dict[int, int] = {}
+        finished: Dict[int, CrawlResult] = {}
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                # Hand out work to idle workers, retries first
+                for worker in workers:
+                    if worker.task is not None:
+                        continue
+                    if retry:
+                        index, url = retry.pop(0)
+                    elif not exhausted:
+                        try:
+                            index, url = next(pending)
+                        except StopIteration:
+                            exhausted = True
+                            continue
+                    else:
+                        continue
+                    attempts[index] = attempts.get(index, 0) + 1
+                    timeout = self._url_timeout + (self._startup_timeout if worker.fresh else 0)
+                    worker.fresh = False
+                    worker.assign(index, url, timeout)
+
+                if exhausted and not retry and all(worker.task is None for worker in workers):
+                    break
+
+                done: List[Optional[CrawlResult]] = []
+                try:
+                    key, index, result, error = results.get(timeout=0.1)
+                    worker = next((w for w in workers if w.key == key), None)
+                    # Results of terminated workers or of tasks that already timed out are dropped
+                    if worker is not None and worker.task is not None and worker.task[0] == index:
+                        url = worker.task[1]
+                        worker.task = None
+                        done.append(self._result(index, url, result, error, attempts, retry))
+                except queue.Empty:
+                    pass
+
+                now = time.monotonic()
+                for slot, worker in enumerate(workers):
+                    crashed = not worker.process.is_alive()
+                    timed_out = worker.task is not None and now > worker.deadline
+                    if not crashed and not timed_out:
+                        continue
+                    error = "Timeout" if timed_out and not crashed else f"Worker crashed ({worker.process.exitcode})"
+                    logging.info(f"{error}, restarting worker {slot}.")
+                    task = worker.task
+                    worker.stop(force=True)
+                    workers[slot] = _Worker(self._context, slot, next(generations), target_args)
+                    if task is not None:
+                        done.append(self._result(task[0], task[1], None, error, attempts, retry))
+
+                for crawl_result in done:
+                    if crawl_result is None:
+                        continue
+                    if not self._ordered:
+                        yield crawl_result
+                        continue
+                    finished[crawl_result.index] = crawl_result
+                    while next_index in finished:
+                        yield finished.pop(next_index)
+                        next_index += 1
+        finally:
+            for worker in workers:
+                worker.stop(force=worker.task is not None)
+
+    def _result(self, index: int, url: str, result: Any, error: Optional[str], attempts: Dict[int, int],
+                retry: List[Tuple[int, str]]) -> Optional[CrawlResult]:
+        if error is not None and attempts[index] <= self._retries:
+            logging.info(f"Retrying {url}: {error}")
+            retry.append((index, url))
+            return None
+        return CrawlResult(index, url, result, error, attempts.pop(index))
+
+
+def crawl(urls: Iterable[str], callback: Callable[[WebDriverWrapper], Any], **kwargs) -> Iterator[CrawlResult]:
+    """
+    Shortcut for CrawlRunner(callback, **kwargs).run(urls)
+    """
+    return CrawlRunner(callback, **kwargs).run(urls)
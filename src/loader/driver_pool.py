@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+from ..wrapper.web_driver_wrapper import WebDriverWrapper
+from .set_up_driver import get_firefox_driver
+
+
+class DriverPool:
+    """
+    Keeps a number of started browsers around and hands out ready WebDriverWrapper instances, so that the browser
+    start up is not paid for every page.
+
+    Usage:
+        pool = DriverPool(functools.partial(get_chrome_driver, headless=True), min_size=2, max_size=4)
+        with pool.driver() as driver:
+            driver.get("example.com")
+    """
+    _factory: Callable[[], WebDriverWrapper]
+    _min_size: int
+    _max_size: int
+    _max_uses: Optional[int]
+    _reset_on_return: bool
+    _idle: Deque[WebDriverWrapper]
+    _uses: Dict[int, int]
+    _size: int
+    _closed: bool
+
+    def __init__(self, factory: Callable[[], WebDriverWrapper] = get_firefox_driver, min_size: int = 1,
+                 max_size: int = 4, max_uses: Optional[int] = 100, reset_on_return: bool = True):
+        """
+        :param factory: Callable that starts a new browser, e.g. get_firefox_driver or get_chrome_driver
+        :param min_size: Number of browsers that are started up front and kept alive
+        :param max_size: Maximum number of browsers alive at the same time
+        :param max_uses: A browser is closed and replaced after it has been checked out this often, None to disable
+        :param reset_on_return: If True cookies and storage are cleared and about:blank is loaded on return
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self._factory = factory
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_uses = max_uses
+        self._reset_on_return = reset_on_return
+        self._idle = deque()
+        self._uses = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        for _ in range(min_size):
+            self._size += 1
+            self._idle.append(self._create())
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """ Number of browsers alive, idle and checked out. """
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _create(self) -> WebDriverWrapper:
+        try:
+            driver = self._factory()
+        except:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self._uses[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver: WebDriverWrapper) -> None:
+        self._uses.pop(id(driver), None)
+        driver.close_driver()
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def checkout(self, timeout: Optional[float] = None) -> WebDriverWrapper:
+        """
+        Hands out an idle browser, starts a new one if the pool is not full, or waits for a browser to be returned.
+        :param timeout: Maximum time in seconds to wait for a browser, None waits forever
+        :return: A ready WebDriverWrapper, return it with checkin
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            create = False
+            with self._condition:
+                while not self._idle and self._size >= self._max_size and not self._closed:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No driver available after {timeout} seconds")
+                    self._condition.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if self._idle:
+                    driver = self._idle.popleft()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                driver = self._create()
+            elif not driver.is_alive():
+                logging.info("Discarding unresponsive driver from pool.")
+                self._discard(driver)
+                continue
+
+            self._uses[id(driver)] += 1
+            return driver
+
+    def checkin(self, driver: WebDriverWrapper) -> None:
+        """
+        Returns a browser to the pool. It is reset, or replaced if it is worn out or does not respond anymore.
+        """
+        if id(driver) not in self._uses:
+            raise ValueError("Driver does not belong to this pool")
+
+        if self._closed or (self._max_uses is not None and self._uses[id(driver)] >= self._max_uses):
+            self._discard(driver)
+            self._refill()
+            return
+
+        if self._reset_on_return:
+            try:
+                driver.reset_session()
+            except Exception:
+                logging.info("Failed to reset driver, discarding it.")
+                self._discard(driver)
+                self._refill()
+                return
+
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def _refill(self) -> None:
+        with self._condition:
+            if self._closed or self._size >= self._min_size:
+                return
+            self._size += 1
+        driver = self._create()
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[WebDriverWrapper]:
+        driver = self.checkout(timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def close(self) -> None:
+        """ Closes all idle browsers, browsers still checked out are closed when they are returned. """
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for driver in idle:
+            self._discard(driver)
@@ -0,0 +1,558 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .js_scripts import ANCESTRY_SCRIPT, COMMON_ANCESTOR_SCRIPT, MARK_ELEMENTS_SCRIPT, SNAPSHOT_SCRIPT
+from .web_driver_wrapper import WebDriverWrapper
+
+# Key of element references in the W3C WebDriver protocol
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class AsyncWebElementWrapper:
+    """
+    asyncio counterpart of WebElementWrapper. Everything that needs the browser is a coroutine, so properties
+    like rect or text are methods here: await element.rect()
+    """
+    _id: str
+    _driver: AsyncWebDriverWrapper
+    _parent: Optional[AsyncWebElementWrapper]
+    _css: Dict
+    _cache: Dict[Any, Any]
+    _cache_epoch: Optional[int]
+
+    def __init__(self, element_id: str, driver: AsyncWebDriverWrapper):
+        self._id = element_id
+        self._driver = driver
+        self._parent = None
+        self._css = {}
+        self._cache = {}
+        self._cache_epoch = None
+
+    def __repr__(self):
+        return f"AsyncWebElementWrapper({self._id!r})"
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElementWrapper) and self._id == other.id
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def _path(self, command: str = "") -> str:
+        return f"/element/{self._id}{command}"
+
+    def _valid_cache(self) -> Dict[Any, Any]:
+        if self._cache_epoch != self._driver.page_epoch:
+            self._cache = {}
+            self._cache_epoch = self._driver.page_epoch
+        return self._cache
+
+    def _store_snapshot(self, snapshot: Dict) -> None:
+        cache = self._valid_cache()
+        for field in ("rect", "tag_name", "text"):
+            if field in snapshot:
+                cache[field] = snapshot[field]
+        for name, value in snapshot.get("attributes", {}).items():
+            cache[("attribute", name)] = value
+        for name, value in snapshot.get("css", {}).items():
+            cache[("css", name)] = value
+
+    def refresh(self) -> None:
+        """
+        Drops all locally stored values, the next reads go to the browser again.
+        """
+        self._cache = {}
+
+    async def find_element_by_xpath(self, xpath: str) -> AsyncWebElementWrapper:
+        return await self._driver._find_element("xpath", xpath, self)
+
+    async def find_elements_by_xpath(self, xpath: str) -> List[AsyncWebElementWrapper]:
+        return await self._driver._find_elements("xpath", xpath, self)
+
+    async def find_element_by_css_selector(self, css_selector: str) -> AsyncWebElementWrapper:
+        return await self._driver._find_element("css selector", css_selector, self)
+
+    async def find_elements_by_css_selector(self, css_selector: str) -> List[AsyncWebElementWrapper]:
+        return await self._driver._find_elements("css selector", css_selector, self)
+
+    async def find_element_by_class_name(self, name: str) -> AsyncWebElementWrapper:
+        return await self._driver._find_element("css selector", f".{name}", self)
+
+    async def find_elements_by_class_name(self, name: str) -> List[AsyncWebElementWrapper]:
+        return await self._driver._find_elements("css selector", f".{name}", self)
+
+    async def click(self) -> None:
+        await self._driver.execute("POST", self._path("/click"), {})
+        self._driver.invalidate_element_cache()
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        cache = self._valid_cache()
+        if ("attribute", name) in cache:
+            return cache[("attribute", name)]
+        return await self._driver.execute("GET", self._path(f"/attribute/{name}"))
+
+    async def value_of_css_property(self, property_name: str) -> str:
+        cache = self._valid_cache()
+        if ("css", property_name) in cache:
+            return cache[("css", property_name)]
+        return await self._driver.execute("GET", self._path(f"/css/{property_name}"))
+
+    async def rect(self) -> Dict[str, float]:
+        """ Cached until the page epoch of the driver changes or refresh is called. """
+        cache = self._valid_cache()
+        if "rect" not in cache:
+            cache["rect"] = await self._driver.execute("GET", self._path("/rect"))
+        return cache["rect"]
+
+    async def size(self) -> float:
+        rect = await self.rect()
+        return rect["height"] * rect["width"]
+
+    async def has_width_or_height(self) -> bool:
+        rect = await self.rect()
+        return rect["width"] > 0 or rect["height"] > 0
+
+    async def parent(self) -> AsyncWebElementWrapper:
+        if not self._parent:
+            self._parent = await self.find_element_by_xpath("./..")
+        return self._parent
+
+    async def children(self) -> List[AsyncWebElementWrapper]:
+        return await self.find_elements_by_xpath("./child::*")
+
+    async def tag_name(self) -> str:
+        cache = self._valid_cache()
+        if "tag_name" not in cache:
+            cache["tag_name"] = await self._driver.execute("GET", self._path("/name"))
+        return cache["tag_name"]
+
+    async def text(self) -> str:
+        cache = self._valid_cache()
+        if "text" in cache:
+            return cache["text"]
+        text = (await self._driver.execute("GET", self._path("/text"))).strip()
+        if not text and await self.tag_name() == "input":
+            value = await self._driver.execute("GET", self._path("/property/value"))
+            text = (value or "").strip()
+        return text
+
+    @property
+    def css(self) -> Dict:
+        return self._css
+
+    @css.setter
+    def css(self, new_value: Dict) -> None:
+        self._css = new_value
+
+    async def is_displayed(self) -> bool:
+        return await self._driver.execute("GET", self._path("/displayed"))
+
+    async def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(await self._driver.execute("GET", self._path("/screenshot")))
+
+    async def get_screenshot_as_file(self, filename: str) -> None:
+        png = await self.get_screenshot_as_png()
+        with open(filename, "wb") as f:
+            f.write(png)
+
+    async def is_in_window_or_has_size(self) -> bool:
+        """
+        Checks if element is in window (right bottom of element has non-negative x and y)
+        or elements height and width are greater than 0.
+        :return: True if element is (potentially) visible, otherwise False.
+        """
+        rect = await self.rect()
+        if ((rect["x"] + rect["width"]) >= 0 and (rect["y"] + rect["height"]) >= 0) \
+                or (rect["height"] > 0 and rect["width"] > 0):
+            return True
+        return False
+
+    async def visually_contains(self, other: AsyncWebElementWrapper) -> bool:
+        """
+        Check if this element contains other by comparing left upper and right lower bounding box points.
+        :param other: Another AsyncWebElementWrapper
+        :return: bool
+        """
+        rect, other_rect = await asyncio.gather(self.rect(), other.rect())
+        if other_rect["x"] < rect["x"] or other_rect["y"] < rect["y"]:
+            return False
+        if other_rect["x"] + other_rect["width"] > rect["x"] + rect["width"]:
+            return False
+        if other_rect["y"] + other_rect["height"] > rect["y"] + rect["height"]:
+            return False
+        return True
+
+
+class AsyncWebDriverWrapper:
+    """
+    asyncio counterpart of WebDriverWrapper. It sends W3C WebDriver commands directly to the driver server
+    (geckodriver, chromedriver, a Selenium grid) over a pooled aiohttp session, so that many commands, of one or
+    of many browser sessions, can be awaited concurrently from a single event loop.
+
+    Usage:
+        async with await AsyncWebDriverWrapper.create("http://localhost:4444", {"browserName": "firefox"}) as driver:
+            await driver.get("example.com")
+            links = await driver.find_elements_by_tag_name("a")
+            rects = await asyncio.gather(*(link.rect() for link in links))
+
+    Requires aiohttp.
+    """
+    _executor_url: str
+    _session_id: str
+    _owns_http: bool
+    _owns_session: bool
+    _page_rect: Optional[Dict[str, float]]
+    _page_size: Optional[float]
+    _url: Optional[str]
+    _page_epoch: int
+
+    def __init__(self, executor_url: str, session_id: str, http: Optional[Any] = None, max_connections: int = 100,
+                 owns_session: bool = False):
+        """
+        :param executor_url: Url of the WebDriver server, e.g. http://localhost:4444
+        :param session_id: Id of an existing WebDriver session
+        :param http: aiohttp.ClientSession to share the connection pool between several wrappers
+        :param max_connections: Size of the connection pool if http is not given
+        :param owns_session: If True, close also deletes the WebDriver session
+        """
+        self._executor_url = executor_url.rstrip("/")
+        self._session_id = session_id
+        self._owns_http = http is None
+        self._http = http if http is not None else self._create_http(max_connections)
+        self._owns_session = owns_session
+        self._error_handler = ErrorHandler()
+        self._page_rect = None
+        self._page_size = None
+        self._url = None
+        self._page_epoch = 0
+
+    @staticmethod
+    def _create_http(max_connections: int) -> Any:
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError("AsyncWebDriverWrapper requires aiohttp, install it with pip install aiohttp") from e
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=max_connections))
+
+    @classmethod
+    async def create(cls, executor_url: str, capabilities: Optional[Dict] = None, http: Optional[Any] = None,
+                     max_connections: int = 100) -> AsyncWebDriverWrapper:
+        """
+        Starts a new WebDriver session, it is deleted again by close.
+        :param executor_url: Url of the WebDriver server, e.g. http://localhost:4444
+        :param capabilities: W3C capabilities to always match, e.g. {"browserName": "firefox"}
+        """
+        owns_http = http is None
+        if owns_http:
+            http = cls._create_http(max_connections)
+        payload = {"capabilities": {"alwaysMatch": capabilities or {}}}
+        async with http.post(f"{executor_url.rstrip('/')}/session", json=payload) as response:
+            body = await response.text()
+        if response.status >= 400:
+            if owns_http:
+                await http.close()
+            ErrorHandler().check_response({"status": response.status, "value": body})
+        session_id = json.loads(body)["value"]["sessionId"]
+        driver = cls(executor_url, session_id, http=http, owns_session=True)
+        driver._owns_http = owns_http
+        return driver
+
+    @classmethod
+    def from_driver(cls, driver: Union[WebDriver, WebDriverWrapper], http: Optional[Any] = None,
+                    max_connections: int = 100) -> AsyncWebDriverWrapper:
+        """
+        Attaches to the session of a synchronous driver, e.g. one started with get_firefox_driver.
+        The session stays owned by the synchronous driver.
+        """
+        if isinstance(driver, WebDriverWrapper):
+            driver = driver.raw_driver
+        return cls(driver.command_executor._url, driver.session_id, http=http, max_connections=max_connections)
+
+    async def __aenter__(self) -> AsyncWebDriverWrapper:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        try:
+            if self._owns_session:
+                await self.execute("DELETE", "")
+        finally:
+            if self._owns_http:
+                await self._http.close()
+
+    def _reset(self) -> None:
+        self._page_rect = None
+        self._page_size = None
+        self._url = None
+        self._new_page_epoch()
+
+    def _new_page_epoch(self) -> None:
+        self._page_epoch += 1
+
+    @property
+    def page_epoch(self) -> int:
+        return self._page_epoch
+
+    def invalidate_element_cache(self) -> None:
+        """ Drops cached values of all elements of this driver, e.g. after the page changed dynamically. """
+        self._new_page_epoch()
+
+    @property
+    def session_id(self) -> str:
+        return self._session_id
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, AsyncWebElementWrapper):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElementWrapper(value[ELEMENT_KEY], self)
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    async def execute(self, method: str, command: str, payload: Optional[Dict] = None) -> Any:
+        """
+        Sends a single W3C WebDriver command of this session.
+        :param method: HTTP method
+        :param command: Path relative to the session, e.g. /url
+        :param payload: JSON body
+        :return: The unwrapped value of the response, element references become AsyncWebElementWrapper
+        """
+        url = f"{self._executor_url}/session/{self._session_id}{command}"
+        async with self._http.request(method, url, json=payload) as response:
+            body = await response.text()
+        if response.status >= 400:
+            self._error_handler.check_response({"status": response.status, "value": body})
+        return self._unwrap(json.loads(body).get("value"))
+
+    async def get(self, url: str, wait_time: float = 0) -> bool:
+        """
+        Load page and check if page is accessible
+        :param url: url to load
+        :param wait_time: Time to wait after page load, e.g. to load dynamic content
+        :return: True if page could be loaded, False otherwise
+        """
+        self._reset()
+        self._url = url
+        try:
+            if not url.startswith("http"):
+                if not url.startswith("www"):
+                    url = f"www.{url}"
+                url = f"http://{url}"
+            await self.execute("POST", "/url", {"url": url})
+            await asyncio.sleep(wait_time)
+            await self.find_element_by_css_selector("body")
+            return True
+        except Exception:
+            logging.info(f"{url} failed to load.")
+            return False
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    async def page_rect(self) -> Dict[str, float]:
+        if not self._page_rect:
+            self._page_rect = await (await self.find_element_by_css_selector("body")).rect()
+        return self._page_rect
+
+    async def page_size(self) -> float:
+        if not self._page_size:
+            page_rect = await self.page_rect()
+            self._page_size = page_rect["height"] * page_rect["width"]
+        return self._page_size
+
+    async def page_source(self) -> str:
+        return await self.execute("GET", "/source")
+
+    async def domain(self) -> str:
+        return await self.execute_script("return document.domain;")
+
+    async def execute_script(self, script: str, *args) -> Any:
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))})
+
+    async def execute_async_script(self, script: str, *args) -> Any:
+        return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(list(args))})
+
+    async def execute_script_from_file(self, file: str, *args) -> Any:
+        with open(file, "r") as f:
+            script = f.read()
+        return await self.execute_script(script, *args)
+
+    async def snapshot_elements(self, elements: List[AsyncWebElementWrapper],
+                                fields: Tuple[str, ...] = ("rect", "tag_name", "text"),
+                                attributes: Tuple[str, ...] = (), css_properties: Tuple[str, ...] = ()) -> List[Dict]:
+        """
+        Same as WebDriverWrapper.snapshot_elements, collects properties of many elements with one script call.
+        """
+        if not elements:
+            return []
+        snapshots = await self.execute_script(SNAPSHOT_SCRIPT, list(elements), list(fields), list(attributes),
+                                              list(css_properties))
+        for element, snapshot in zip(elements, snapshots):
+            element._store_snapshot(snapshot)
+        return snapshots
+
+    async def _find_element(self, using: str, value: str,
+                            parent: Optional[AsyncWebElementWrapper] = None) -> AsyncWebElementWrapper:
+        command = parent._path("/element") if parent else "/element"
+        return await self.execute("POST", command, {"using": using, "value": value})
+
+    async def _find_elements(self, using: str, value: str,
+                             parent: Optional[AsyncWebElementWrapper] = None) -> List[AsyncWebElementWrapper]:
+        command = parent._path("/elements") if parent else "/elements"
+        return await self.execute("POST", command, {"using": using, "value": value})
+
+    async def find_element_by_xpath(self, xpath: str) -> AsyncWebElementWrapper:
+        return await self._find_element("xpath", xpath)
+
+    async def find_elements_by_xpath(self, xpath: str) -> List[AsyncWebElementWrapper]:
+        return await self._find_elements("xpath", xpath)
+
+    async def find_element_by_css_selector(self, css_selector: str) -> AsyncWebElementWrapper:
+        return await self._find_element("css selector", css_selector)
+
+    async def find_elements_by_css_selector(self, css_selector: str) -> List[AsyncWebElementWrapper]:
+        return await self._find_elements("css selector", css_selector)
+
+    async def find_element_by_class_name(self, name: str) -> AsyncWebElementWrapper:
+        return await self._find_element("css selector", f".{name}")
+
+    async def find_elements_by_class_name(self, name: str) -> List[AsyncWebElementWrapper]:
+        return await self._find_elements("css selector", f".{name}")
+
+    async def find_element_by_id(self, name: str) -> AsyncWebElementWrapper:
+        return await self._find_element("css selector", f"[id=\"{name}\"]")
+
+    async def find_elements_by_id(self, name: str) -> List[AsyncWebElementWrapper]:
+        return await self._find_elements("css selector", f"[id=\"{name}\"]")
+
+    async def find_element_by_tag_name(self, name: str) -> AsyncWebElementWrapper:
+        return await self._find_element("css selector", name)
+
+    async def find_elements_by_tag_name(self, name: str) -> List[AsyncWebElementWrapper]:
+        return await self._find_elements("css selector", name)
+
+    async def get_window_rect(self) -> Dict:
+        return await self.execute("GET", "/window/rect")
+
+    async def get_window_size(self) -> Dict:
+        rect = await self.get_window_rect()
+        return {"width": rect["width"], "height": rect["height"]}
+
+    async def set_window_size(self, width: float, height: float) -> None:
+        await self.execute("POST", "/window/rect", {"width": int(width), "height": int(height)})
+        self._new_page_epoch()
+
+    async def get_window_position(self) -> Dict:
+        rect = await self.get_window_rect()
+        return {"x": rect["x"], "y": rect["y"]}
+
+    async def get_viewport_rect(self) -> Dict:
+        """ This returns only the actual content rect of the page that is visible to the user.
+            Ignores for example header of the window."""
+        return await self.execute_script("return {\"width\": window.innerWidth, \"height\": window.innerHeight};")
+
+    async def get_viewport_size(self) -> float:
+        viewport = await self.get_viewport_rect()
+        return float(viewport["height"] * viewport["width"])
+
+    async def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(await self.execute("GET", "/screenshot"))
+
+    async def get_screenshot_as_file(self, filename: str) -> None:
+        png = await self.get_screenshot_as_png()
+        with open(filename, "wb") as f:
+            f.write(png)
+
+    async def relative_size_of_element(self, element: AsyncWebElementWrapper) -> float:
+        size, page_size = await asyncio.gather(element.size(), self.page_size())
+        return size / page_size
+
+    async def element_size_is_larger_than_fraction_of_window_size(self, element: AsyncWebElementWrapper,
+                                                                  ratio: float) -> bool:
+        size, window_size = await asyncio.gather(element.size(), self.get_window_size())
+        return size >= ratio * window_size["height"] * window_size["width"]
+
+    async def check_ancestry(self, child: AsyncWebElementWrapper, ancestor: AsyncWebElementWrapper) -> bool:
+        """
+        check if ancestor is ancestor of child
+        :param child: child node
+        :param ancestor: possible ancestor
+        :return: bool
+        """
+        return (await self.check_ancestry_of_elements(ancestor, [child]))[0]
+
+    async def check_ancestry_of_elements(self, ancestor: AsyncWebElementWrapper,
+                                         children: List[AsyncWebElementWrapper]) -> List[bool]:
+        if not children:
+            return []
+        try:
+            return await self.execute_script(ANCESTRY_SCRIPT, ancestor, list(children))
+        except WebDriverException:
+            return [False] * len(children)
+
+    async def check_if_element_is_ancestor_of_multiple_elements(self, ancestor: AsyncWebElementWrapper,
+                                                                childs: List[AsyncWebElementWrapper]) -> bool:
+        return all(await self.check_ancestry_of_elements(ancestor, childs))
+
+    async def get_common_ancestor(self, elements: List[AsyncWebElementWrapper]) -> AsyncWebElementWrapper:
+        if len(elements) == 0:
+            logging.error("Empty list provided for AsyncWebDriverWrapper.get_common_ancestor")
+
+        common_ancestor = elements[0]
+
+        if len(elements) != 1:
+            common_ancestor = await self.execute_script(COMMON_ANCESTOR_SCRIPT, list(elements))
+            if common_ancestor is None:
+                raise NoSuchElementException("Elements have no common ancestor")
+
+        return common_ancestor
+
+    async def mark_elements(self, elements: Union[AsyncWebElementWrapper, List[AsyncWebElementWrapper],
+                                                  Tuple[AsyncWebElementWrapper, ...]],
+                            color: str = "red", border_width: str = "6px", border_style: str = "solid") -> None:
+        """
+        Marks elements on a page by setting a border, with a single script call.
+        """
+        if not elements:
+            return
+
+        if isinstance(elements, AsyncWebElementWrapper):
+            elements = [elements]
+
+        await self.execute_script(MARK_ELEMENTS_SCRIPT, list(elements), color, border_width, border_style)
+
+    async def switch_to_main_frame(self) -> None:
+        await self.execute("POST", "/frame", {"id": None})
+        self._new_page_epoch()
+
+    async def switch_to_frame(self, element: AsyncWebElementWrapper) -> None:
+        await self.execute("POST", "/frame", {"id": {ELEMENT_KEY: element.id}})
+        self._new_page_epoch()
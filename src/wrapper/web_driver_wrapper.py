@@ -1,10 +1,14 @@
 import logging
 import time
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+from selenium.common.exceptions import NoAlertPresentException, NoSuchElementException, \
+    UnexpectedAlertPresentException, WebDriverException
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 
+from .js_scripts import ANCESTRY_SCRIPT, COLLECT_DIALOGS_SCRIPT, COMMON_ANCESTOR_SCRIPT, DIALOG_OVERRIDE_SCRIPT, \
+    SNAPSHOT_SCRIPT
+from .page_readiness import wait_until_ready
 from .web_element_wrapper import WebElementWrapper
 
 
@@ -17,12 +21,22 @@ class WebDriverWrapper:
     _page_rect: Optional[Dict[str, float]]
     _page_size: Optional[float]
     _url: Optional[str]
+    _page_epoch: int
+    _time_to_ready: Optional[float]
+    _suppressed_dialogs: List[Dict[str, Any]]
+    _dialog_override_active: bool
+    _dialog_override_on_new_document: bool
 
     def __init__(self, driver: WebDriver):
         self._driver = driver
         self._page_rect = None
         self._page_size = None
         self._url = None
+        self._page_epoch = 0
+        self._time_to_ready = None
+        self._suppressed_dialogs = []
+        self._dialog_override_active = False
+        self._dialog_override_on_new_document = False
 
     def __del__(self):
         self.close_driver()
@@ -31,6 +45,24 @@ class WebDriverWrapper:
         self._page_rect = None
         self._page_size = None
         self._url = None
+        self._time_to_ready = None
+        self._dialog_override_active = False
+        self._new_page_epoch()
+
+    def _new_page_epoch(self) -> None:
+        self._page_epoch += 1
+
+    @property
+    def page_epoch(self) -> int:
+        """
+        Counter that changes whenever cached element values may be outdated: on page loads, frame switches and
+        window resizes. WebElementWrapper drops its cached rect and tag name when it changes.
+        """
+        return self._page_epoch
+
+    def invalidate_element_cache(self) -> None:
+        """ Drops cached values of all elements of this driver, e.g. after the page changed dynamically. """
+        self._new_page_epoch()
 
     def close_driver(self):
         try:
@@ -39,14 +71,52 @@ class WebDriverWrapper:
         except:
             pass
 
-    def get(self, url: str, wait_time: int = 0, close_alert=False) -> bool:
+    def is_alive(self) -> bool:
+        """
+        Cheap health check, sends a trivial script to the browser.
+        :return: True if the browser still answers, False otherwise
+        """
+        try:
+            return self._driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def reset_session(self) -> None:
+        """
+        Brings the browser back to a blank state: clears local and session storage of the current page,
+        deletes all cookies and navigates to about:blank.
+        """
+        try:
+            self._driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # Storage is not accessible on some pages, e.g. about:blank or data urls
+            pass
+        self._collect_dialogs()
+        if hasattr(self._driver, "execute_cdp_cmd"):
+            # WebDriver only deletes cookies of the current domain, chrome can drop all of them at once
+            self._driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self._driver.delete_all_cookies()
+        self._driver.get("about:blank")
+        self._reset()
+
+    def get(self, url: str, wait_time: float = 0, close_alert=False,
+            wait_until: Optional[Union[str, Sequence[str]]] = None, ready_predicate: Optional[str] = None,
+            quiet_period: float = 0.5) -> bool:
         """
         Load page and check if page is accessible
         :param url: url to load
-        :param wait_time: Time to wait after page load, e.g. to load dynamic content
-        :param close_alert: If True possible alert windows on the page are automatically accepted.
-        :return: True if page could be loaded, False otherwise
+        :param wait_time: Time to wait after page load, e.g. to load dynamic content. If wait_until or ready_predicate
+                          is given, this is the upper bound and the wait ends as soon as the page is ready.
+        :param close_alert: If True alert, confirm and prompt dialogs on the page are dismissed without waiting
+                            for them and recorded in suppressed_dialogs.
+        :param wait_until: Readiness conditions checked in the browser, any of page_readiness.READY_STATE, DOM_QUIET
+                           and NETWORK_IDLE
+        :param ready_predicate: JavaScript expression, the page is ready once it evaluates to a truthy value
+        :param quiet_period: Seconds without DOM mutations or finished requests for DOM_QUIET and NETWORK_IDLE
+        :return: True if page could be loaded, False otherwise. The time until the page was ready is available
+                 as time_to_ready afterwards.
         """
+        self._collect_dialogs()
         self._reset()
         self._url = url
         try:
@@ -54,23 +124,92 @@ class WebDriverWrapper:
                 if not url.startswith("www"):
                     url = f"www.{url}"
                 url = f"http://{url}"
-            self._driver.get(url)
-            time.sleep(wait_time)
-            self._driver.find_element_by_css_selector("body")
             if close_alert:
-                def close_alert_helper():
-                    alert = self._driver.switch_to.alert
-                    if alert:
-                        alert.dismiss()
-                try:
-                    WebDriverWait(self._driver, timeout=1).until(close_alert_helper())
-                except:
-                    pass
+                self._override_dialogs_on_new_document()
+            start = time.monotonic()
+            try:
+                self._driver.get(url)
+            except UnexpectedAlertPresentException as e:
+                if not close_alert:
+                    raise
+                self._record_dialog("alert", e.alert_text)
+            if wait_until or ready_predicate:
+                waited = wait_until_ready(self._driver, wait_until or [], ready_predicate, timeout=wait_time,
+                                          quiet_period=quiet_period)
+                if waited is None:
+                    logging.info(f"{url} was not ready after {wait_time} seconds.")
+                else:
+                    self._time_to_ready = time.monotonic() - start
+            else:
+                time.sleep(wait_time)
+                self._time_to_ready = time.monotonic() - start
+            if close_alert:
+                self._suppress_dialogs()
+            self._driver.find_element_by_css_selector("body")
             return True
         except:
             logging.info(f"{url} failed to load.")
             return False
 
+    def _record_dialog(self, dialog_type: str, message: Optional[str]) -> None:
+        self._suppressed_dialogs.append({"url": self._url, "type": dialog_type, "message": message or ""})
+
+    def _override_dialogs_on_new_document(self) -> None:
+        """
+        Chrome can run the dialog override before any page script, it only needs to be registered once.
+        """
+        if self._dialog_override_on_new_document or not hasattr(self._driver, "execute_cdp_cmd"):
+            return
+        self._driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DIALOG_OVERRIDE_SCRIPT})
+        self._dialog_override_on_new_document = True
+
+    def _suppress_dialogs(self) -> None:
+        """
+        Installs the in-page override of alert, confirm and prompt, if it is not already running since document
+        creation. A dialog that is already open is recorded and dismissed, without waiting for one to appear.
+        """
+        for _ in range(3):
+            try:
+                if not self._dialog_override_on_new_document:
+                    self._driver.execute_script(DIALOG_OVERRIDE_SCRIPT)
+                self._dialog_override_active = True
+                return
+            except UnexpectedAlertPresentException as e:
+                self._record_dialog("alert", e.alert_text)
+                try:
+                    self._driver.switch_to.alert.dismiss()
+                except NoAlertPresentException:
+                    pass
+
+    def _collect_dialogs(self) -> None:
+        if not self._dialog_override_active:
+            return
+        try:
+            for dialog in self._driver.execute_script(COLLECT_DIALOGS_SCRIPT):
+                self._record_dialog(dialog["type"], dialog["message"])
+        except WebDriverException:
+            pass
+
+    @property
+    def suppressed_dialogs(self) -> List[Dict[str, Any]]:
+        """
+        Dialogs suppressed by get(close_alert=True), as dicts with url, type (alert, confirm or prompt) and message.
+        Remove entries from the returned list to clear it.
+        """
+        self._collect_dialogs()
+        return self._suppressed_dialogs
+
+    @property
+    def time_to_ready(self) -> Optional[float]:
+        """
+        Seconds from the start of the last get until the page was ready, None if it did not get ready in time.
+        """
+        return self._time_to_ready
+
+    @property
+    def raw_driver(self) -> WebDriver:
+        return self._driver
+
     @property
     def url(self) -> str:
         return self._url
@@ -111,35 +250,61 @@ class WebDriverWrapper:
             script = f.read()
         return self.execute_script(script, *args)
 
+    def snapshot_elements(self, elements: List[WebElementWrapper],
+                          fields: Iterable[str] = ("rect", "tag_name", "text"),
+                          attributes: Iterable[str] = (), css_properties: Iterable[str] = ()) -> List[Dict]:
+        """
+        Collects properties of many elements with a single script call. The values are stored on the wrappers,
+        so that later reads of rect, tag_name, text, get_attribute and value_of_css_property are served locally
+        until the page epoch changes or WebElementWrapper.refresh is called.
+        :param elements: Elements to collect the values for
+        :param fields: Any of "rect", "tag_name" and "text"
+        :param attributes: Attribute names, looked up like WebElementWrapper.get_attribute
+        :param css_properties: Names of computed css properties
+        :return: One dict per element with the keys given in fields, plus "attributes" and "css" if requested
+        """
+        fields = list(fields)
+        unknown = set(fields) - {"rect", "tag_name", "text"}
+        if unknown:
+            raise ValueError(f"Unknown snapshot fields: {sorted(unknown)}")
+        if not elements:
+            return []
+
+        snapshots = self._driver.execute_script(SNAPSHOT_SCRIPT, [el.raw_element for el in elements], fields,
+                                                list(attributes), list(css_properties))
+        for element, snapshot in zip(elements, snapshots):
+            element._store_snapshot(snapshot)
+        return snapshots
+
     def find_element_by_xpath(self, xpath: str) -> WebElementWrapper:
-        return WebElementWrapper(self._driver.find_element_by_xpath(xpath))
+        return WebElementWrapper(self._driver.find_element_by_xpath(xpath), self)
 
     def find_elements_by_xpath(self, xpath: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._driver.find_elements_by_xpath(xpath)]
+        return [WebElementWrapper(el, self) for el in self._driver.find_elements_by_xpath(xpath)]
 
     def find_element_by_css_selector(self, css_selector: str) -> WebElementWrapper:
-        return WebElementWrapper(self._driver.find_element_by_css_selector(css_selector))
+        return WebElementWrapper(self._driver.find_element_by_css_selector(css_selector), self)
 
     def find_elements_by_css_selector(self, css_selector: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._driver.find_elements_by_css_selector(css_selector)]
+        return [WebElementWrapper(el, self) for el in self._driver.find_elements_by_css_selector(css_selector)]
 
     def find_element_by_class_name(self, name: str) -> WebElementWrapper:
-        return WebElementWrapper(self._driver.find_element_by_class_name(name))
+        return WebElementWrapper(self._driver.find_element_by_class_name(name), self)
 
     def find_elements_by_class_name(self, name: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._driver.find_elements_by_class_name(name)]
+        return [WebElementWrapper(el, self) for el in self._driver.find_elements_by_class_name(name)]
 
     def find_element_by_id(self, name: str) -> WebElementWrapper:
-        return WebElementWrapper(self._driver.find_element_by_id(name))
+        return WebElementWrapper(self._driver.find_element_by_id(name), self)
 
     def find_elements_by_id(self, name: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._driver.find_elements_by_id(name)]
+        return [WebElementWrapper(el, self) for el in self._driver.find_elements_by_id(name)]
 
     def find_element_by_tag_name(self, name: str) -> WebElementWrapper:
-        return WebElementWrapper(self._driver.find_element_by_tag_name(name))
+        return WebElementWrapper(self._driver.find_element_by_tag_name(name), self)
 
     def find_elements_by_tag_name(self, name: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._driver.find_elements_by_tag_name(name)]
+        return [WebElementWrapper(el, self) for el in self._driver.find_elements_by_tag_name(name)]
 
     def get_window_rect(self) -> Dict:
         return self._driver.get_window_rect()
@@ -149,6 +314,7 @@ class WebDriverWrapper:
 
     def set_window_size(self, width: float, height: float) -> None:
         self._driver.set_window_size(width, height)
+        self._new_page_epoch()
 
     def get_window_position(self) -> Dict:
         return self._driver.get_window_position()
@@ -164,6 +330,7 @@ class WebDriverWrapper:
 
     def fullscreen_window(self, wait_time: float) -> None:
         self._driver.fullscreen_window()
+        self._new_page_epoch()
         time.sleep(wait_time)
 
     def get_screenshot_as_file(self, filename: str) -> None:
@@ -203,20 +370,40 @@ class WebDriverWrapper:
         except:
             return False
 
+    def check_ancestry_of_elements(self, ancestor: WebElementWrapper, children: List[WebElementWrapper]) -> List[bool]:
+        """
+        Batched version of check_ancestry, checks all elements with a single script call.
+        :param ancestor: possible ancestor
+        :param children: possible descendants
+        :return: For each element in children, True if ancestor is a proper ancestor of it
+        """
+        if not children:
+            return []
+        try:
+            return self._driver.execute_script(ANCESTRY_SCRIPT, ancestor.raw_element,
+                                               [child.raw_element for child in children])
+        except WebDriverException:
+            return [False] * len(children)
+
     def check_if_element_is_ancestor_of_multiple_elements(self, ancestor: WebElementWrapper,
                                                           childs: List[WebElementWrapper]):
-        return all([self.check_ancestry(child, ancestor) for child in childs])
+        return all(self.check_ancestry_of_elements(ancestor, childs))
 
     def get_common_ancestor(self, elements: List[WebElementWrapper]) -> WebElementWrapper:
+        """
+        Lowest element that is a proper ancestor of all given elements, computed in the browser with one script call.
+        A single element is its own common ancestor.
+        """
         if len(elements) == 0:
             logging.error("Empty list provided for WebDriverWrapper.get_common_ancestor")
 
         common_ancestor = elements[0]
 
         if len(elements) != 1:
-            common_ancestor = common_ancestor.parent
-            while not self.check_if_element_is_ancestor_of_multiple_elements(common_ancestor, elements[1:]):
-                common_ancestor = common_ancestor.parent
+            ancestor = self._driver.execute_script(COMMON_ANCESTOR_SCRIPT, [el.raw_element for el in elements])
+            if ancestor is None:
+                raise NoSuchElementException("Elements have no common ancestor")
+            common_ancestor = WebElementWrapper(ancestor, self)
 
         return common_ancestor
 
@@ -296,6 +483,8 @@ class WebDriverWrapper:
 
     def switch_to_main_frame(self) -> None:
         self._driver.switch_to.default_content()
+        self._new_page_epoch()
 
     def switch_to_frame(self, element: WebElementWrapper):
         self._driver.switch_to.frame(element.raw_element)
+        self._new_page_epoch()
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Optional, Dict, List
 
 from selenium.webdriver.remote.webelement import WebElement
 
+if TYPE_CHECKING:
+    from .web_driver_wrapper import WebDriverWrapper
+
 
 class WebElementWrapper:
     _element: WebElement
     _parent: Optional[WebElementWrapper]
     _css: Dict
+    _driver: Optional[WebDriverWrapper]
+    _cache: Dict[Any, Any]
+    _cache_epoch: Optional[int]
 
-    def __init__(self, element: WebElement):
+    def __init__(self, element: WebElement, driver: Optional[WebDriverWrapper] = None):
+        """
+        :param element: The selenium element
+        :param driver: The WebDriverWrapper the element was found with. Rect and tag name are only cached if it
+                       is given, since its page epoch tells when the cached values are outdated.
+        """
         self._element = element
+        self._driver = driver
         self._parent = None
         self._css = {}
+        self._cache = {}
+        self._cache_epoch = None
 
     def __repr__(self):
         return f"WebElementWrapper({self._element!r})"
@@ -32,35 +46,79 @@ class WebElementWrapper:
         return self._element
 
     def find_element_by_xpath(self, xpath: str) -> WebElementWrapper:
-        return WebElementWrapper(self._element.find_element_by_xpath(xpath))
+        return WebElementWrapper(self._element.find_element_by_xpath(xpath), self._driver)
 
     def find_elements_by_xpath(self, xpath: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._element.find_elements_by_xpath(xpath)]
+        return [WebElementWrapper(el, self._driver) for el in self._element.find_elements_by_xpath(xpath)]
 
     def find_element_by_css_selector(self, css_selector: str) -> WebElementWrapper:
-        return WebElementWrapper(self._element.find_element_by_css_selector(css_selector))
+        return WebElementWrapper(self._element.find_element_by_css_selector(css_selector), self._driver)
 
     def find_elements_by_css_selector(self, css_selector: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._element.find_elements_by_css_selector(css_selector)]
+        return [WebElementWrapper(el, self._driver) for el in self._element.find_elements_by_css_selector(css_selector)]
 
     def find_element_by_class_name(self, name: str) -> WebElementWrapper:
-        return WebElementWrapper(self._element.find_element_by_class_name(name))
+        return WebElementWrapper(self._element.find_element_by_class_name(name), self._driver)
 
     def find_elements_by_class_name(self, name: str) -> List[WebElementWrapper]:
-        return [WebElementWrapper(el) for el in self._element.find_elements_by_class_name(name)]
+        return [WebElementWrapper(el, self._driver) for el in self._element.find_elements_by_class_name(name)]
+
+    def _valid_cache(self) -> Dict[Any, Any]:
+        if self._driver is not None and self._cache_epoch != self._driver.page_epoch:
+            self._cache = {}
+            self._cache_epoch = self._driver.page_epoch
+        return self._cache
+
+    def _cached(self, key: Any, fetch: Callable[[], Any]) -> Any:
+        cache = self._valid_cache()
+        if key in cache:
+            return cache[key]
+        value = fetch()
+        if self._driver is not None:
+            cache[key] = value
+        return value
+
+    def _store_snapshot(self, snapshot: Dict) -> None:
+        """
+        Stores values collected by WebDriverWrapper.snapshot_elements, later reads are served from them.
+        """
+        self._valid_cache()
+        for field in ("rect", "tag_name", "text"):
+            if field in snapshot:
+                self._cache[field] = snapshot[field]
+        for name, value in snapshot.get("attributes", {}).items():
+            self._cache[("attribute", name)] = value
+        for name, value in snapshot.get("css", {}).items():
+            self._cache[("css", name)] = value
+
+    def refresh(self) -> None:
+        """
+        Drops all locally stored values, the next reads go to the browser again.
+        """
+        self._cache = {}
 
     def click(self) -> None:
-        return self._element.click()
+        self._element.click()
+        if self._driver is not None:
+            # The click may have changed the page
+            self._driver.invalidate_element_cache()
 
     def get_attribute(self, name):
+        cache = self._valid_cache()
+        if ("attribute", name) in cache:
+            return cache[("attribute", name)]
         return self._element.get_attribute(name)
 
     def value_of_css_property(self, property_name: str) -> str:
+        cache = self._valid_cache()
+        if ("css", property_name) in cache:
+            return cache[("css", property_name)]
         return self.raw_element.value_of_css_property(property_name)
 
     @property
     def rect(self) -> Dict[str, float]:
-        return self._element.rect
+        """ Cached until the page epoch of the driver changes or refresh is called. """
+        return self._cached("rect", lambda: self._element.rect)
 
     @property
     def size(self) -> float:
@@ -75,19 +133,22 @@ class WebElementWrapper:
     @property
     def parent(self) -> WebElementWrapper:
         if not self._parent:
-            self._parent = WebElementWrapper(self._element.find_element_by_xpath("./.."))
+            self._parent = WebElementWrapper(self._element.find_element_by_xpath("./.."), self._driver)
         return self._parent
 
     @property
     def children(self) -> List[WebElementWrapper]:
-        return [WebElementWrapper(child) for child in self._element.find_elements_by_xpath("./child::*")]
+        return [WebElementWrapper(child, self._driver) for child in self._element.find_elements_by_xpath("./child::*")]
 
     @property
     def tag_name(self) -> str:
-        return self._element.tag_name
+        return self._cached("tag_name", lambda: self._element.tag_name)
 
     @property
     def text(self) -> str:
+        cache = self._valid_cache()
+        if "text" in cache:
+            return cache["text"]
         text = self._element.text.strip()
         if not text:
             if self.raw_element.tag_name == "input":
@@ -117,9 +178,9 @@ class WebElementWrapper:
         or elements height and width are greater than 0.
         :return: True if element is (potentially) visible, otherwise False.
         """
-        if ((self._element.rect["x"] + self._element.rect["width"]) >= 0
-            and (self._element.rect["y"] + self._element.rect["height"]) >= 0) \
-                or (self._element.rect["height"] > 0 and self._element.rect["width"] > 0):
+        rect = self.rect
+        if ((rect["x"] + rect["width"]) >= 0 and (rect["y"] + rect["height"]) >= 0) \
+                or (rect["height"] > 0 and rect["width"] > 0):
             return True
         return False
 
@@ -129,10 +190,11 @@ class WebElementWrapper:
         :param other: Another WebElementWrapper
         :return: bool
         """
-        if other.rect["x"] < self.rect["x"] or other.rect["y"] < self.rect["y"]:
+        rect, other_rect = self.rect, other.rect
+        if other_rect["x"] < rect["x"] or other_rect["y"] < rect["y"]:
             return False
-        if other.rect["x"] + other.rect["width"] > self.rect["x"] + self.rect["width"]:
+        if other_rect["x"] + other_rect["width"] > rect["x"] + rect["width"]:
             return False
-        if other.rect["y"] + other.rect["height"] > self.rect["y"] + self.rect["height"]:
+        if other_rect["y"] + other_rect["height"] > rect["y"] + rect["height"]:
             return False
         return True